@@ -1,171 +1,453 @@
-import json
+import argparse
+import asyncio
+import csv
+import hashlib
+import orjson
+from collections import defaultdict
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import os
+import random
+import sys
 import time
 from pathlib import Path
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
+import tiktoken
 from tqdm import tqdm
 
 # Configuration
 ENHANCED_SCRIPT_JSON = "enhanced_script.json"
 OUTPUT_DIR = "sound_effects_catalog"
 NORMALIZED_EFFECTS_FILE = "normalized_sound_effects.json"
+PARTIAL_RESULTS_FILE = "normalization_partial.jsonl"
+BATCH_INPUT_FILE = "batch_input.jsonl"
+BATCH_POLL_INTERVAL = 60
+NORM_CACHE_FILE = "norm_cache.json"
 
-# Initialize OpenAI client
+# Rate limiting for parallel normalization requests (cookbook parallel-processor pattern)
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 30000
+MAX_ATTEMPTS = 5
+
+# Batch packing: bigger batches amortize per-request overhead, bounded so the
+# structured output stays comfortably inside the model's output budget
+BATCH_SIZE = 50
+MAX_TOKENS_PER_REQUEST = 8000
+
+# Initialize OpenAI clients
 client = OpenAI()
+aclient = AsyncOpenAI()
 
-def normalize_sound_effects_with_llm(effect_descriptions):
-    """Use OpenAI to normalize sound effect descriptions"""
-    try:
-        # Group similar sound effects to reduce API calls
-        unique_effects = list(set(effect_descriptions))
-        
-        # Batch effects to minimize API calls (up to 20 at a time)
-        normalized_effects = {}
-        
-        for i in range(0, len(unique_effects), 20):
-            batch = unique_effects[i:i+20]
-            
-            # Prepare the descriptions as a bulleted list
-            effect_list = "\n".join([f"- {effect}" for effect in batch])
-            
-            response = client.responses.create(
-                model="gpt-4o",
-                input=[
-                    {"role": "system", "content": "You're a sound design expert helping normalize sound effect descriptions for searching in professional sound libraries."},
-                    {"role": "user", "content": f"Please normalize these sound effect descriptions into standard search terms that would work well in a sound effect library. For each term, provide a normalized version that's concise but specific enough to find good matches. Here are the descriptions:\n\n{effect_list}"}
-                ],
-                text={
-                    "format": {
-                        "type": "json_schema",
-                        "name": "sound_effect_normalization",
-                        "schema": {
-                            "type": "object",
-                            "additionalProperties": False,
-                            "properties": {
-                                "normalized_effects": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "additionalProperties": False,
-                                        "properties": {
-                                            "original": {
-                                                "type": "string",
-                                                "description": "The original sound effect description"
-                                            },
-                                            "normalized": {
-                                                "type": "string",
-                                                "description": "The normalized search term for sound libraries"
-                                            },
-                                            "category": {
-                                                "type": "string",
-                                                "description": "General category of the sound (ambient, action, technology, body, transition, etc.)"
-                                            },
-                                            "description": {
-                                                "type": "string",
-                                                "description": "Brief description of what to look for in a sound library"
-                                            },
-                                            "alternative_search_terms": {
-                                                "type": "array",
-                                                "items": {
-                                                    "type": "string"
-                                                },
-                                                "description": "Alternative search terms that might yield good results"
-                                            }
-                                        },
-                                        "required": ["original", "normalized", "category", "description", "alternative_search_terms"]
-                                    }
-                                }
-                            },
-                            "required": ["normalized_effects"]
-                        },
-                        "strict": True
+SYSTEM_PROMPT = "You're a sound design expert helping normalize sound effect descriptions for searching in professional sound libraries."
+
+# Retry policy for transient API failures (429s, disconnects, timeouts)
+API_RETRY = retry(
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, APITimeoutError)),
+    reraise=True
+)
+
+@API_RETRY
+def create_response(**request_body):
+    """Issue a synchronous Responses call, retrying transient failures"""
+    return client.responses.create(**request_body)
+
+# Minimal schema for the bulk pass: only the fields every downstream consumer
+# needs. Fewer output tokens means faster responses and less TPM per batch.
+NORMALIZATION_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "normalized_effects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "properties": {
+                    "original": {
+                        "type": "string",
+                        "description": "The original sound effect description"
+                    },
+                    "normalized": {
+                        "type": "string",
+                        "description": "The normalized search term for sound libraries"
+                    },
+                    "category": {
+                        "type": "string",
+                        "description": "General category of the sound (ambient, action, technology, body, transition, etc.)"
                     }
+                },
+                "required": ["original", "normalized", "category"]
+            }
+        }
+    },
+    "required": ["normalized_effects"]
+}
+
+# Richer fields are generated lazily per effect via enrich_effect
+ENRICHMENT_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "description": {
+            "type": "string",
+            "description": "Brief description of what to look for in a sound library"
+        },
+        "alternative_search_terms": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "Alternative search terms that might yield good results"
+        }
+    },
+    "required": ["description", "alternative_search_terms"]
+}
+
+def build_normalization_request(batch):
+    """Build the Responses API request body for a batch of effect descriptions"""
+    # Prepare the descriptions as a bulleted list
+    effect_list = "\n".join([f"- {effect}" for effect in batch])
+
+    return {
+        "model": "gpt-4o",
+        "input": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Please normalize these sound effect descriptions into standard search terms that would work well in a sound effect library. For each term, provide only a normalized version that's concise but specific enough to find good matches, plus its category. Here are the descriptions:\n\n{effect_list}"}
+        ],
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "sound_effect_normalization",
+                "schema": NORMALIZATION_SCHEMA,
+                "strict": True
+            }
+        }
+    }
+
+def estimate_request_tokens(request_body):
+    """Estimate the token cost of a request so we can debit the TPM bucket up front"""
+    encoding = tiktoken.get_encoding("cl100k_base")
+    input_tokens = sum(len(encoding.encode(message["content"])) for message in request_body["input"])
+    # Assume the structured output roughly doubles the input size
+    return input_tokens * 2
+
+def make_batches(effects):
+    """Pack effects into batches bounded by both count and estimated token cost"""
+    encoding = tiktoken.get_encoding("cl100k_base")
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for effect in effects:
+        # Assume the structured output roughly doubles the input size
+        effect_tokens = len(encoding.encode(effect)) * 2
+        if current and (len(current) >= BATCH_SIZE or current_tokens + effect_tokens > MAX_TOKENS_PER_REQUEST):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(effect)
+        current_tokens += effect_tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+def parse_normalization_response(output_text):
+    """Parse a normalization response into a dict of original -> effect info"""
+    normalized_effects = {}
+    normalization_data = orjson.loads(output_text)
+    for item in normalization_data["normalized_effects"]:
+        normalized_effects[item["original"]] = {
+            "normalized": item["normalized"],
+            "category": item["category"],
+            # Filled in lazily by enrich_effect for effects that are actually used
+            "description": item.get("description", ""),
+            "alternative_search_terms": item.get("alternative_search_terms", [])
+        }
+    return normalized_effects
+
+def enrich_effect(original_description):
+    """Generate the richer search metadata for a single effect on demand"""
+    try:
+        response = create_response(
+            model="gpt-4o",
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"For this sound effect description, provide a brief description of what to look for in a sound library and alternative search terms that might yield good results:\n\n{original_description}"}
+            ],
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "sound_effect_enrichment",
+                    "schema": ENRICHMENT_SCHEMA,
+                    "strict": True
                 }
-            )
-            
+            }
+        )
+        return orjson.loads(response.output_text)
+    except Exception as e:
+        print(f"Error enriching effect: {str(e)}")
+        return {"description": "", "alternative_search_terms": []}
+
+async def _normalize_batches(batches, partial_path):
+    """Run normalization batches concurrently under RPM/TPM throttling"""
+    normalized_effects = {}
+
+    # Shared capacity buckets, refilled by elapsed time (cookbook parallel-processor pattern)
+    capacity = {
+        "requests": MAX_REQUESTS_PER_MINUTE,
+        "tokens": MAX_TOKENS_PER_MINUTE,
+        "last_update": time.monotonic()
+    }
+    capacity_lock = asyncio.Lock()
+
+    async def acquire_capacity(tokens_needed):
+        """Wait until a request slot and enough tokens are available, then debit them"""
+        while True:
+            async with capacity_lock:
+                now = time.monotonic()
+                elapsed = now - capacity["last_update"]
+                capacity["requests"] = min(capacity["requests"] + MAX_REQUESTS_PER_MINUTE * elapsed / 60, MAX_REQUESTS_PER_MINUTE)
+                capacity["tokens"] = min(capacity["tokens"] + MAX_TOKENS_PER_MINUTE * elapsed / 60, MAX_TOKENS_PER_MINUTE)
+                capacity["last_update"] = now
+
+                if capacity["requests"] >= 1 and capacity["tokens"] >= tokens_needed:
+                    capacity["requests"] -= 1
+                    capacity["tokens"] -= tokens_needed
+                    return
+            await asyncio.sleep(0.1)
+
+    async def normalize_batch(batch):
+        """Normalize one batch with retries and exponential backoff"""
+        request_body = build_normalization_request(batch)
+        tokens_needed = estimate_request_tokens(request_body)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            await acquire_capacity(tokens_needed)
             try:
-                normalization_data = json.loads(response.output_text)
-                for item in normalization_data["normalized_effects"]:
-                    normalized_effects[item["original"]] = {
-                        "normalized": item["normalized"],
-                        "category": item["category"],
-                        "description": item["description"],
-                        "alternative_search_terms": item["alternative_search_terms"]
-                    }
+                response = await aclient.responses.create(**request_body)
             except Exception as e:
-                print(f"Error parsing LLM response: {str(e)}")
-                
-            # Add a small delay to avoid rate limiting
-            time.sleep(0.5)
-        
+                if attempt == MAX_ATTEMPTS:
+                    print(f"Batch failed after {MAX_ATTEMPTS} attempts: {str(e)}")
+                    return {}
+                delay = min(2 ** attempt + random.random(), 30)
+                print(f"Batch attempt {attempt} failed ({str(e)}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                batch_results = parse_normalization_response(response.output_text)
+            except Exception as e:
+                # Bad output for a big batch: bisect and retry the halves rather
+                # than throwing away every entry in it
+                if len(batch) > 1:
+                    print(f"Error parsing LLM response ({str(e)}), bisecting batch of {len(batch)}")
+                    mid = len(batch) // 2
+                    halves = await asyncio.gather(
+                        normalize_batch(batch[:mid]),
+                        normalize_batch(batch[mid:])
+                    )
+                    return {**halves[0], **halves[1]}
+                print(f"Error parsing LLM response for '{batch[0]}': {str(e)}")
+                return {}
+
+            # Append partial results so one failed batch doesn't lose the rest
+            with open(partial_path, "ab") as f:
+                for original, effect_info in batch_results.items():
+                    f.write(orjson.dumps({"original": original, **effect_info}) + b"\n")
+
+            return batch_results
+
+    results = await asyncio.gather(*(normalize_batch(batch) for batch in batches))
+    for batch_results in results:
+        normalized_effects.update(batch_results)
+
+    return normalized_effects
+
+def cache_version_key():
+    """Version the cache by prompt and model so prompt edits invalidate cleanly"""
+    return hashlib.sha256(SYSTEM_PROMPT.encode() + b"gpt-4o").hexdigest()[:8]
+
+def load_normalization_cache():
+    """Load the persistent normalization cache from disk"""
+    cache_path = Path(OUTPUT_DIR) / NORM_CACHE_FILE
+    if cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            print(f"Error reading normalization cache: {str(e)}")
+    return {}
+
+def save_normalization_cache(cache):
+    """Atomically rewrite the normalization cache"""
+    cache_path = Path(OUTPUT_DIR) / NORM_CACHE_FILE
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, cache_path)
+
+def submit_batch(unique_effects):
+    """Normalize effects through the Batch API (50% cheaper, separate rate-limit pool)"""
+    batches = make_batches(unique_effects)
+
+    # Write one Batch API line per packed batch
+    batch_input_path = os.path.join(OUTPUT_DIR, BATCH_INPUT_FILE)
+    with open(batch_input_path, "wb") as f:
+        for i, batch in enumerate(batches):
+            f.write(orjson.dumps({
+                "custom_id": f"effects_{i}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": build_normalization_request(batch)
+            }) + b"\n")
+
+    # Upload the input file and submit the batch
+    with open(batch_input_path, "rb") as f:
+        batch_file = client.files.create(file=f, purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(batches)} requests")
+
+    # Poll until the batch finishes
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        print(f"Batch status: {batch.status}, checking again in {BATCH_POLL_INTERVAL}s...")
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        print(f"Batch {batch.id} finished with status {batch.status}")
+        return {}
+
+    # Download the results and parse each line back into the effects dict
+    normalized_effects = {}
+    output = client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = orjson.loads(line)
+            output_text = result["response"]["body"]["output"][0]["content"][0]["text"]
+            normalized_effects.update(parse_normalization_response(output_text))
+        except Exception as e:
+            print(f"Error parsing batch result line: {str(e)}")
+
+    return normalized_effects
+
+def normalize_sound_effects_with_llm(effect_descriptions, interactive=False, use_cache=True):
+    """Use OpenAI to normalize sound effect descriptions"""
+    try:
+        # Group similar sound effects to reduce API calls
+        unique_effects = list(set(effect_descriptions))
+
+        # Check the persistent cache first so re-runs only pay for new effects
+        cache = load_normalization_cache() if use_cache else {}
+        version_key = cache_version_key()
+        cached_effects = cache.setdefault(version_key, {})
+
+        normalized_effects = {effect: cached_effects[effect] for effect in unique_effects if effect in cached_effects}
+        misses = [effect for effect in unique_effects if effect not in cached_effects]
+        print(f"Normalization cache: {len(normalized_effects)} hits, {len(misses)} misses")
+
+        if not misses:
+            return normalized_effects
+
+        # Default to the Batch API for this offline bulk job; interactive=True
+        # keeps the parallel online path for quick turnaround
+        if not interactive:
+            fresh_effects = submit_batch(misses)
+        else:
+            # Pack effects into larger batches to minimize API calls
+            batches = make_batches(misses)
+
+            partial_path = os.path.join(OUTPUT_DIR, PARTIAL_RESULTS_FILE)
+            print(f"Normalizing {len(misses)} effects in {len(batches)} parallel batches...")
+
+            fresh_effects = asyncio.run(_normalize_batches(batches, partial_path))
+
+        if use_cache and fresh_effects:
+            cached_effects.update(fresh_effects)
+            save_normalization_cache(cache)
+
+        normalized_effects.update(fresh_effects)
         return normalized_effects
-    
+
     except Exception as e:
         print(f"Error calling OpenAI API: {str(e)}")
         return {}
     
     
-def extract_and_normalize_sound_effects():
+def extract_and_normalize_sound_effects(interactive=False, use_cache=True):
     """Extract sound effects from the enhanced script and normalize them"""
     # Create output directory if it doesn't exist
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     # Read the enhanced script JSON
     try:
-        with open(ENHANCED_SCRIPT_JSON, 'r', encoding='utf-8') as f:
-            script_data = json.load(f)
+        with open(ENHANCED_SCRIPT_JSON, 'rb') as f:
+            script_data = orjson.loads(f.read())
     except Exception as e:
         print(f"Error reading enhanced script JSON: {str(e)}")
         return
     
-    # Extract all sound effects
-    all_effects = []
-    effect_to_lines = {}
-    
+    # Extract all sound effects in a single pass
+    effect_to_lines = defaultdict(list)
+
     for i, line in enumerate(script_data["lines"]):
-        if "sound_effects" in line and line["sound_effects"]:
-            for effect in line["sound_effects"]:
-                all_effects.append(effect)
-                if effect not in effect_to_lines:
-                    effect_to_lines[effect] = []
-                effect_to_lines[effect].append(i)
-    
-    print(f"Found {len(all_effects)} sound effect references across {len(effect_to_lines)} unique descriptions")
+        for effect in line.get("sound_effects") or ():
+            effect_to_lines[effect].append(i)
+
+    total_references = sum(len(indices) for indices in effect_to_lines.values())
+    print(f"Found {total_references} sound effect references across {len(effect_to_lines)} unique descriptions")
     
     # Normalize the sound effects using OpenAI
     print("Normalizing sound effect descriptions using language model...")
-    normalized_effects = normalize_sound_effects_with_llm(list(effect_to_lines.keys()))
+    normalized_effects = normalize_sound_effects_with_llm(list(effect_to_lines.keys()), interactive, use_cache)
     
+    # Materialize the per-line fields once so hot lines don't reslice the script
+    texts = [line["original_text"] for line in script_data["lines"]]
+    emotions = [line.get("emotion", "neutral") for line in script_data["lines"]]
+    intensities = [line.get("intensity", 5) for line in script_data["lines"]]
+
+    @lru_cache(maxsize=None)
+    def context_window(idx):
+        """Surrounding lines (2 before, 2 after) for a line index, computed once"""
+        start_idx = max(0, idx - 2)
+        end_idx = min(len(texts), idx + 3)
+        return tuple(texts[start_idx:end_idx])
+
     # Create a full catalog with scene context
     catalog = []
-    
+
     for original_effect, effect_info in normalized_effects.items():
         line_indices = effect_to_lines[original_effect]
-        
+
         # Get context from each line where this effect is used
-        contexts = []
-        for idx in line_indices:
-            if idx < len(script_data["lines"]):
-                line = script_data["lines"][idx]
-                
-                # Get surrounding lines for context
-                start_idx = max(0, idx - 2)
-                end_idx = min(len(script_data["lines"]), idx + 3)
-                context_lines = [script_data["lines"][i]["original_text"] for i in range(start_idx, end_idx)]
-                
-                contexts.append({
-                    "line_index": idx,
-                    "line_text": line["original_text"],
-                    "context": context_lines,
-                    "emotion": line.get("emotion", "neutral"),
-                    "intensity": line.get("intensity", 5)
-                })
+        contexts = [
+            {
+                "line_index": idx,
+                "line_text": texts[idx],
+                "context": list(context_window(idx)),
+                "emotion": emotions[idx],
+                "intensity": intensities[idx]
+            }
+            for idx in line_indices
+        ]
         
-        # Add to catalog
+        # Add to catalog (intern the category so later group/sort comparisons
+        # are pointer checks)
         catalog_entry = {
             "original_description": original_effect,
             "normalized": effect_info["normalized"],
-            "category": effect_info["category"],
+            "category": sys.intern(effect_info["category"]),
             "description": effect_info["description"],
             "alternative_search_terms": effect_info["alternative_search_terms"],
             "occurrences": len(line_indices),
@@ -179,12 +461,12 @@ def extract_and_normalize_sound_effects():
     catalog.sort(key=lambda x: (x["category"], -x["occurrences"]))
     
     # Save the normalized effects
-    with open(os.path.join(OUTPUT_DIR, NORMALIZED_EFFECTS_FILE), 'w', encoding='utf-8') as f:
-        json.dump({
+    with open(os.path.join(OUTPUT_DIR, NORMALIZED_EFFECTS_FILE), 'wb') as f:
+        f.write(orjson.dumps({
             "total_unique_effects": len(catalog),
-            "total_effect_references": len(all_effects),
+            "total_effect_references": total_references,
             "catalog": catalog
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2))
     
     # Create a human-readable catalog
     create_human_readable_catalog(catalog)
@@ -193,52 +475,54 @@ def extract_and_normalize_sound_effects():
 
 def create_human_readable_catalog(catalog):
     """Create a human-readable catalog of sound effects"""
+    # Accumulate the whole document and write it out once; thousands of tiny
+    # f.write calls each pay the text-IO and encode overhead separately
+    parts = []
+    parts.append("# Sound Effects Catalog\n\n")
+    parts.append(f"Total unique sound effects: {len(catalog)}\n\n")
+
+    # The catalog arrives sorted by category, so group with a single groupby
+    # pass instead of building a dict of lists
+    for category, entries in groupby(catalog, key=itemgetter("category")):
+        parts.append(f"## {category.title()} Sounds\n\n")
+
+        # Write each sound effect
+        for entry in entries:
+            parts.append(f"### {entry['normalized']}\n\n")
+            parts.append(f"**Original Description:** {entry['original_description']}\n\n")
+            parts.append(f"**Description:** {entry['description']}\n\n")
+            parts.append(f"**Alternative Search Terms:** {', '.join(entry['alternative_search_terms'])}\n\n")
+            parts.append(f"**Occurrences:** {entry['occurrences']}\n\n")
+
+            # Write a few example contexts
+            parts.append("**Example Contexts:**\n\n")
+            for i, context in enumerate(entry["contexts"][:3]):  # Show max 3 examples
+                parts.append(f"Context {i+1}:\n")
+                parts.append("```\n")
+                for line in context["context"]:
+                    if line == context["line_text"]:
+                        parts.append(f"> {line}\n")
+                    else:
+                        parts.append(f"{line}\n")
+                parts.append("```\n\n")
+
+            parts.append("---\n\n")
+
     with open(os.path.join(OUTPUT_DIR, "sound_effects_catalog.md"), 'w', encoding='utf-8') as f:
-        f.write("# Sound Effects Catalog\n\n")
-        f.write(f"Total unique sound effects: {len(catalog)}\n\n")
-        
-        # Group by category
-        categories = {}
-        for entry in catalog:
-            category = entry["category"]
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(entry)
-        
-        # Write each category
-        for category, entries in categories.items():
-            f.write(f"## {category.title()} Sounds\n\n")
-            
-            # Write each sound effect
-            for entry in entries:
-                f.write(f"### {entry['normalized']}\n\n")
-                f.write(f"**Original Description:** {entry['original_description']}\n\n")
-                f.write(f"**Description:** {entry['description']}\n\n")
-                f.write(f"**Alternative Search Terms:** {', '.join(entry['alternative_search_terms'])}\n\n")
-                f.write(f"**Occurrences:** {entry['occurrences']}\n\n")
-                
-                # Write a few example contexts
-                f.write("**Example Contexts:**\n\n")
-                for i, context in enumerate(entry["contexts"][:3]):  # Show max 3 examples
-                    f.write(f"Context {i+1}:\n")
-                    f.write("```\n")
-                    for line in context["context"]:
-                        if line == context["line_text"]:
-                            f.write(f"> {line}\n")
-                        else:
-                            f.write(f"{line}\n")
-                    f.write("```\n\n")
-                
-                f.write("---\n\n")
+        f.write("".join(parts))
     
     print(f"Created human-readable catalog: {os.path.join(OUTPUT_DIR, 'sound_effects_catalog.md')}")
     
-    # Also create a CSV for easier importing
-    with open(os.path.join(OUTPUT_DIR, "sound_effects_list.csv"), 'w', encoding='utf-8') as f:
-        f.write("Category,Normalized Name,Description,Alternative Search Terms,Occurrences\n")
-        for entry in catalog:
-            alt_terms = "|".join(entry["alternative_search_terms"])
-            f.write(f"\"{entry['category']}\",\"{entry['normalized']}\",\"{entry['description']}\",\"{alt_terms}\",{entry['occurrences']}\n")
+    # Also create a CSV for easier importing; csv.writer quotes correctly
+    # (hand-built rows broke on descriptions containing quotes) and batches in C
+    with open(os.path.join(OUTPUT_DIR, "sound_effects_list.csv"), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Category", "Normalized Name", "Description", "Alternative Search Terms", "Occurrences"])
+        writer.writerows(
+            (entry["category"], entry["normalized"], entry["description"],
+             "|".join(entry["alternative_search_terms"]), entry["occurrences"])
+            for entry in catalog
+        )
     
     print(f"Created CSV list: {os.path.join(OUTPUT_DIR, 'sound_effects_list.csv')}")
 
@@ -248,8 +532,13 @@ def create_human_readable_catalog(catalog):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Extract sound effects from the enhanced script and normalize them.')
+    parser.add_argument('--interactive', action='store_true', help='Normalize with parallel online requests instead of the Batch API')
+    parser.add_argument('--no-cache', action='store_true', help='Skip the persistent normalization cache')
+    args = parser.parse_args()
+
     print("Extracting and normalizing sound effects...")
-    catalog = extract_and_normalize_sound_effects()
+    catalog = extract_and_normalize_sound_effects(interactive=args.interactive, use_cache=not args.no_cache)
     
     if catalog:
         print(f"Created sound effects catalog with {len(catalog)} unique effects")
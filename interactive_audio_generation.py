@@ -1,12 +1,110 @@
+from functools import lru_cache
 from pathlib import Path
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 from pydub import AudioSegment
-from pydub.playback import play
+import httpx
+import simpleaudio as sa
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
 import os
-import json
+import orjson
+import shutil
+import subprocess
+import threading
 import time
 import sys
 
+# How many TTS requests to keep in flight during batch generation
+MAX_CONCURRENT_REQUESTS = 16
+
+# How long to debounce script saves before flushing to disk
+FLUSH_INTERVAL = 2.0
+
+# Connection pool sizing for the shared HTTP/2 client; one TLS connection
+# multiplexes all concurrent TTS streams instead of handshaking per request
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0)
+
+# TTS settings and the content-addressed cache for generated takes
+TTS_MODEL = "gpt-4o-mini-tts"
+VOICE = "fable"
+TTS_CACHE_DIR = Path("tts_cache")
+
+# Retry policy for transient API failures (429s, disconnects, timeouts)
+API_RETRY = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, APITimeoutError)),
+    reraise=True
+)
+
+def record_failed_line(line_index, line, error):
+    """Append a permanently failed line to failed.jsonl for later resumption"""
+    with open("failed.jsonl", "ab") as f:
+        f.write(orjson.dumps({
+            "line_index": line_index,
+            "original_text": line["original_text"],
+            "voice_instructions": line["voice_instructions"],
+            "error": str(error)
+        }) + b"\n")
+
+def _tts_key(line):
+    """Content hash of a TTS request so identical lines share one generation"""
+    return hashlib.sha256(f"{VOICE}|{line['voice_instructions']}|{line['original_text']}".encode()).hexdigest()
+
+def fetch_cached_tts(key, dest_file):
+    """Reuse a cached take for this key if one exists; returns True on hit"""
+    cached = TTS_CACHE_DIR / f"{key}.mp3"
+    if not cached.exists():
+        return False
+    if os.path.exists(dest_file):
+        os.remove(dest_file)
+    try:
+        os.link(cached, dest_file)
+    except OSError:
+        # Cross-device links aren't allowed, fall back to a copy
+        shutil.copyfile(cached, dest_file)
+    return True
+
+def store_cached_tts(key, source_file, line, overwrite=False):
+    """Record a freshly generated take in the cache, with metadata for debugging"""
+    TTS_CACHE_DIR.mkdir(exist_ok=True)
+    cached = TTS_CACHE_DIR / f"{key}.mp3"
+    if overwrite and cached.exists():
+        # An explicit regeneration replaces the rejected take
+        os.remove(cached)
+    if not cached.exists():
+        try:
+            os.link(source_file, cached)
+        except OSError:
+            shutil.copyfile(source_file, cached)
+
+    index_path = TTS_CACHE_DIR / "index.json"
+    index = {}
+    if index_path.exists():
+        try:
+            index = orjson.loads(index_path.read_bytes())
+        except Exception:
+            pass
+    index[key] = {
+        "voice": VOICE,
+        "voice_instructions": line["voice_instructions"],
+        "original_text": line["original_text"]
+    }
+    index_path.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+
+@lru_cache(maxsize=64)
+def _decoded(path, mtime):
+    """Decode an MP3 once per (path, mtime); replays skip the ffmpeg decode"""
+    return AudioSegment.from_mp3(path)
+
+def load_audio(path):
+    """Load an MP3 through the decode cache, invalidated automatically on rewrite"""
+    return _decoded(path, os.path.getmtime(path))
+
 class StoryGenerator:
     def __init__(self, json_file, output_dir="audio_output"):
         """Initialize the story generator with the script file and output directory"""
@@ -15,12 +113,31 @@ class StoryGenerator:
         os.makedirs(output_dir, exist_ok=True)
         
         # Load the script data
-        with open(json_file, "r", encoding="utf-8") as f:
-            self.script_data = json.load(f)
-        
-        # Initialize OpenAI client
-        self.client = OpenAI()
+        with open(json_file, "rb") as f:
+            self.script_data = orjson.loads(f.read())
         
+        # Initialize the sync OpenAI client over a shared HTTP/2 connection pool;
+        # the async client is built per batch run inside _agen_lines
+        self._http_client = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        atexit.register(self._http_client.close)
+        self.client = OpenAI(http_client=self._http_client)
+        self.aclient = None
+
+        # Debounce state for script saves; flush anything pending on exit.
+        # The lock serializes saves between the main thread and the prefetch
+        # workers, which also mutate script data and call save_script
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._save_lock = threading.RLock()
+        atexit.register(self._flush_if_dirty)
+
+        # Background pool for prefetching the next line while the user listens
+        self._prefetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._prefetch_futures = {}
+
+        # Handle for the currently playing audio, so playback can be stopped
+        self._play_handle = None
+
         # Verify file paths and update script
         self.validate_audio_files()
         
@@ -28,22 +145,26 @@ class StoryGenerator:
         """Check if audio files exist and update the script accordingly"""
         print("Validating existing audio files...")
         lines_updated = False
-        
+
+        # Read the output directory once instead of stat-ing every file per line
+        with os.scandir(self.output_dir) as it:
+            existing = {entry.name for entry in it if entry.is_file()}
+
         # Ensure every line has an audio_file field
         for i, line in enumerate(self.script_data["lines"]):
             expected_file = f"{self.output_dir}/line{i+1}.mp3"
-            
+
             # Add or update audio_file path
             if "audio_file" in line:
                 # If file doesn't exist, remove the path
-                if not os.path.exists(line["audio_file"]):
+                if os.path.basename(line["audio_file"]) not in existing:
                     print(f"File not found: {line['audio_file']}, marking for regeneration")
                     line.pop("audio_file", None)
                     line["needs_regeneration"] = True
                     lines_updated = True
             else:
                 # Check if the expected file exists
-                if os.path.exists(expected_file):
+                if f"line{i+1}.mp3" in existing:
                     line["audio_file"] = expected_file
                     line["needs_regeneration"] = False
                     lines_updated = True
@@ -61,14 +182,69 @@ class StoryGenerator:
         self.last_generated_line = len(self.script_data["lines"]) - lines_to_generate
         print(f"Last generated line: {self.last_generated_line + 1}")
 
-    def save_script(self):
-        """Save the current script data back to the JSON file"""
-        with open(self.json_file, "w", encoding="utf-8") as f:
-            json.dump(self.script_data, f, indent=2)
+    def _flush_script(self):
+        """Write the current script data back to the JSON file atomically"""
+        with self._save_lock:
+            tmp_file = f"{self.json_file}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(orjson.dumps(self.script_data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, self.json_file)
+            self._dirty = False
+            self._last_flush = time.monotonic()
         print(f"Updated script saved to {self.json_file}")
+
+    def _flush_if_dirty(self):
+        """Flush any unsaved script changes (registered to run at exit)"""
+        with self._save_lock:
+            if self._dirty:
+                self._flush_script()
+
+    def save_script(self, force=False):
+        """Mark the script dirty and flush at most once per FLUSH_INTERVAL"""
+        with self._save_lock:
+            self._dirty = True
+            if force or time.monotonic() - self._last_flush > FLUSH_INTERVAL:
+                self._flush_script()
     
-    def generate_audio_for_line(self, line_index):
-        """Generate audio for a specific line in the script"""
+    @API_RETRY
+    def _do_tts(self, line, temp_file):
+        """Generate speech for a line, retrying transient API failures.
+
+        Streams to a .part file and replaces atomically: temp_file may be a
+        hard link shared with the cache and other identical lines, and
+        writing it in place would truncate the shared inode (and leave a
+        partial file if the stream is interrupted).
+        """
+        part_file = f"{temp_file}.part"
+        with self.client.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=VOICE,
+            input=line["original_text"],
+            instructions=line["voice_instructions"],
+        ) as response:
+            response.stream_to_file(part_file)
+        os.replace(part_file, temp_file)
+
+    @API_RETRY
+    async def _do_tts_async(self, line, temp_file):
+        """Async variant of _do_tts with the same retry and replace behavior"""
+        part_file = f"{temp_file}.part"
+        async with self.aclient.audio.speech.with_streaming_response.create(
+            model=TTS_MODEL,
+            voice=VOICE,
+            input=line["original_text"],
+            instructions=line["voice_instructions"],
+        ) as response:
+            await response.stream_to_file(part_file)
+        os.replace(part_file, temp_file)
+
+    def generate_audio_for_line(self, line_index, use_cache=True):
+        """Generate audio for a specific line in the script.
+
+        use_cache=False forces a fresh take (TTS is nondeterministic, so a
+        rejected line must not come back identical) and replaces the cached
+        entry with the new audio.
+        """
         if line_index >= len(self.script_data["lines"]):
             print("Line index out of range")
             return False
@@ -81,46 +257,65 @@ class StoryGenerator:
         print(f"Voice instructions: {line['voice_instructions']}")
         
         try:
-            # Generate speech using OpenAI's TTS
-            with self.client.audio.speech.with_streaming_response.create(
-                model="gpt-4o-mini-tts",
-                voice="fable",
-                input=line["original_text"],
-                instructions=line["voice_instructions"],
-            ) as response:
-                response.stream_to_file(temp_file)
-            
-            print(f"Generated: {temp_file}")
-            
+            # Reuse a cached take if an identical line was already generated
+            key = _tts_key(line)
+            if use_cache and fetch_cached_tts(key, temp_file):
+                print(f"Reused cached audio: {temp_file}")
+            else:
+                # Generate speech using OpenAI's TTS
+                self._do_tts(line, temp_file)
+                store_cached_tts(key, temp_file, line, overwrite=not use_cache)
+                print(f"Generated: {temp_file}")
+
             # Update the script data
             line["audio_file"] = temp_file
             line["needs_regeneration"] = False
             self.save_script()
-            
+
             return True
         except Exception as e:
             print(f"Error generating audio: {str(e)}")
+            record_failed_line(line_index, line, e)
             return False
     
-    def play_audio(self, line_index):
+    def _play_segment(self, audio, wait=True):
+        """Play a decoded segment with simpleaudio (no ffplay subprocess)"""
+        self._play_handle = sa.play_buffer(
+            audio.raw_data,
+            num_channels=audio.channels,
+            bytes_per_sample=audio.sample_width,
+            sample_rate=audio.frame_rate
+        )
+        if wait:
+            self._play_handle.wait_done()
+
+    def stop_playback(self):
+        """Stop whatever is currently playing"""
+        if self._play_handle is not None:
+            self._play_handle.stop()
+            self._play_handle = None
+
+    def play_audio(self, line_index, wait=True):
         """Play the audio for a specific line"""
         line = self.script_data["lines"][line_index]
-        
+
         if "audio_file" in line and os.path.exists(line["audio_file"]):
             print(f"Playing line {line_index+1}...")
-            audio = AudioSegment.from_mp3(line["audio_file"])
+            audio = load_audio(line["audio_file"])
             ## try to play it and catch sigint (ctrl+c)
             try:
-                play(audio)
+                self._play_segment(audio, wait=wait)
             except KeyboardInterrupt:
-                ## if playback is interrupted, just return
+                ## if playback is interrupted, stop the device and return
+                self.stop_playback()
                 print("Playback interrupted")
                 ## mark the line for regeneration
                 line["needs_regeneration"] = True
                 self.save_script()
                 return False
-            print("Playback finished")
-                
+            if wait:
+                print("Playback finished")
+
             return True
         else:
             print(f"Audio file for line {line_index+1} doesn't exist")
@@ -150,6 +345,33 @@ class StoryGenerator:
         self.save_script()
         return True
     
+    def prefetch_line(self, line_index):
+        """Start generating a line in the background during playback/think time"""
+        if line_index >= len(self.script_data["lines"]):
+            return
+        line = self.script_data["lines"][line_index]
+        # Same default as the interactive loop: a missing flag means the
+        # existing audio stands, so only prefetch lines without audio or
+        # explicitly marked for regeneration
+        if line.get("needs_regeneration", False) or not line.get("audio_file"):
+            if line_index not in self._prefetch_futures:
+                self._prefetch_futures[line_index] = self._prefetch_pool.submit(
+                    self.generate_audio_for_line, line_index
+                )
+
+    def take_prefetched(self, line_index):
+        """Collect the result of a pending prefetch for this line, if any"""
+        future = self._prefetch_futures.pop(line_index, None)
+        if future is not None:
+            return future.result()
+        return None
+
+    def cancel_prefetches(self):
+        """Cancel any prefetches that haven't started so they don't waste tokens"""
+        for future in self._prefetch_futures.values():
+            future.cancel()
+        self._prefetch_futures.clear()
+
     def interactive_generation(self, start_line=0, end_line=None):
         """Generate audio interactively, with feedback after each line"""
         if end_line is None:
@@ -168,6 +390,8 @@ class StoryGenerator:
                     choice = 'y'
                 
                 if choice == 'y':
+                    # Start the next line's TTS while the user listens and decides
+                    self.prefetch_line(line_index + 1)
                     self.play_audio(line_index)
                     while True:
                         ## give the user a chance to regenerate
@@ -185,6 +409,8 @@ class StoryGenerator:
                             break
                         elif choice == 'm':
                             ## modify and regenerate
+                            ## drop queued prefetches so stale requests don't waste tokens
+                            self.cancel_prefetches()
                             print(f"Current instructions: {line['voice_instructions']}")
                             new_instructions = input("Enter new voice instructions: ")
                             line["voice_instructions"] = new_instructions
@@ -201,16 +427,18 @@ class StoryGenerator:
                             self.save_script()
                             break
                         elif choice == 'r':
-                            ## regenerate with same instructions
+                            ## regenerate with same instructions: bypass the
+                            ## cache so the user gets a genuinely new take
                             line["needs_regeneration"] = True
                             self.save_script()
-                            success = self.generate_audio_for_line(line_index)
+                            success = self.generate_audio_for_line(line_index, use_cache=False)
                             if success:
                                 self.play_audio(line_index)
                             else:
                                 print("Failed to regenerate audio")
                         elif choice == 'q':
                             ## quit generation
+                            self.cancel_prefetches()
                             return False
                         else:
                             print("Invalid choice, please try again")
@@ -223,15 +451,19 @@ class StoryGenerator:
                 if not line.get("needs_regeneration", False):
                     continue
             else:
-                # Generate audio for this line
-                success = self.generate_audio_for_line(line_index)
+                # Use the prefetched audio if a background generation already ran
+                success = self.take_prefetched(line_index)
+                if success is None:
+                    # Generate audio for this line
+                    success = self.generate_audio_for_line(line_index)
                 if not success:
                     print(f"Failed to generate audio for line {line_index+1}")
                     continue
-            
-            # Play the generated audio
+
+            # Play the generated audio, prefetching the next line in the background
+            self.prefetch_line(line_index + 1)
             self.play_audio(line_index)
-            
+
             # Get feedback
             while True:
                 print("\nOptions:")
@@ -246,16 +478,19 @@ class StoryGenerator:
                     # Accept and continue
                     break
                 elif choice == 'r':
-                    # Regenerate with same instructions
+                    # Regenerate with same instructions: bypass the cache so
+                    # the user gets a genuinely new take
                     line["needs_regeneration"] = True
                     self.save_script()
-                    success = self.generate_audio_for_line(line_index)
+                    success = self.generate_audio_for_line(line_index, use_cache=False)
                     if success:
                         self.play_audio(line_index)
                     else:
                         print("Failed to regenerate audio")
                 elif choice == 'm':
-                    # Modify instructions and regenerate
+                    # Modify instructions and regenerate; drop queued prefetches
+                    # so stale requests don't waste tokens
+                    self.cancel_prefetches()
                     print(f"Current instructions: {line['voice_instructions']}")
                     new_instructions = input("Enter new voice instructions: ")
                     line["voice_instructions"] = new_instructions
@@ -273,57 +508,190 @@ class StoryGenerator:
                     break
                 elif choice == 'q':
                     # Quit generation
+                    self.cancel_prefetches()
                     return False
         
         return True
     
-    def batch_regeneration(self):
-        """Generate all lines marked for regeneration without interaction"""
-        for line_index, line in enumerate(self.script_data["lines"]):
-            if line.get("needs_regeneration", True):
+    async def _agen_line(self, line_index, sem, use_cache=True):
+        """Generate audio for a single line using the async client"""
+        line = self.script_data["lines"][line_index]
+        temp_file = f"{self.output_dir}/line{line_index+1}.mp3"
+
+        # Reuse a cached take if an identical line was already generated
+        key = _tts_key(line)
+        if use_cache and fetch_cached_tts(key, temp_file):
+            print(f"Reused cached audio: {temp_file}")
+        else:
+            async with sem:
                 print(f"Generating line {line_index+1}...")
-                self.generate_audio_for_line(line_index)
-        
+                await self._do_tts_async(line, temp_file)
+
+            store_cached_tts(key, temp_file, line, overwrite=not use_cache)
+            print(f"Generated: {temp_file}")
+
+        # Update the script data
+        line["audio_file"] = temp_file
+        line["needs_regeneration"] = False
+
+    async def _agen_lines(self, line_indices, use_cache=True):
+        """Generate audio for many lines concurrently, bounded by a semaphore"""
+        # One HTTP/2 client for the whole batch: all concurrent requests
+        # multiplex over a shared connection instead of handshaking each time
+        async with httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT) as http_client:
+            self.aclient = AsyncOpenAI(http_client=http_client)
+            try:
+                sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+                results = await asyncio.gather(
+                    *(self._agen_line(i, sem, use_cache) for i in line_indices),
+                    return_exceptions=True
+                )
+            finally:
+                self.aclient = None
+
+        # Report any lines that failed so they stay marked for regeneration
+        for line_index, result in zip(line_indices, results):
+            if isinstance(result, Exception):
+                print(f"Error generating audio for line {line_index+1}: {str(result)}")
+                record_failed_line(line_index, self.script_data["lines"][line_index], result)
+
+    def _batch_generate_lines(self, line_indices, use_cache=True):
+        """Run the async generation for the given lines and save the script once"""
+        if not line_indices:
+            print("No lines need generation")
+            return
+
+        print(f"Generating {len(line_indices)} lines with up to {MAX_CONCURRENT_REQUESTS} concurrent requests...")
+        asyncio.run(self._agen_lines(line_indices, use_cache))
+        self.save_script(force=True)
         print("Batch generation complete")
-    
+
+    def batch_regeneration(self):
+        """Generate all lines marked for regeneration without interaction.
+
+        These lines were explicitly rejected, so the cache is bypassed —
+        serving the identical cached take back would defeat the regeneration.
+        """
+        line_indices = [i for i, line in enumerate(self.script_data["lines"])
+                        if line.get("needs_regeneration", True)]
+        self._batch_generate_lines(line_indices, use_cache=False)
+
     def batch_generation(self):
         """Generate all ungenerated lines in the script without interaction"""
-        for line_index, line in enumerate(self.script_data["lines"]):
-            if not line.get("audio_file"):
-                print(f"Generating line {line_index+1}...")
-                self.generate_audio_for_line(line_index)
-        print("Batch generation complete")
+        line_indices = [i for i, line in enumerate(self.script_data["lines"])
+                        if not line.get("audio_file")]
+        self._batch_generate_lines(line_indices)
     
+    def _silence_file(self, pause_ms, frame_rate, channels):
+        """Get a pooled silence MP3 of the given duration, rendering it once if needed.
+
+        The silence must match the line audio's sample rate and channel count:
+        the concat demuxer copies frames without resampling, so mixed rates
+        play back at the wrong speed or glitch entirely.
+        """
+        silence_path = f"{self.output_dir}/silence_{pause_ms}_{frame_rate}_{channels}.mp3"
+        if not os.path.exists(silence_path):
+            silence = AudioSegment.silent(duration=pause_ms, frame_rate=frame_rate).set_channels(channels)
+            silence.export(silence_path, format="mp3")
+        return silence_path
+
+    def _combine_with_ffmpeg(self, playable_lines, final_output):
+        """Concatenate MP3 frames with the ffmpeg concat demuxer (no decode/re-encode)"""
+        if not playable_lines:
+            return
+
+        # Decode one line to learn the format every silence file must match
+        reference = load_audio(playable_lines[0]["audio_file"])
+        frame_rate, channels = reference.frame_rate, reference.channels
+
+        entries = []
+        for line in playable_lines:
+            entries.append(f"file '{os.path.abspath(line['audio_file'])}'")
+            pause_ms = int(line["pause_after"] * 1000)
+            if pause_ms > 0:
+                entries.append(f"file '{os.path.abspath(self._silence_file(pause_ms, frame_rate, channels))}'")
+
+        concat_list = f"{self.output_dir}/concat_list.txt"
+        with open(concat_list, "w", encoding="utf-8") as f:
+            f.write("\n".join(entries) + "\n")
+
+        subprocess.run(
+            ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list, "-c", "copy", final_output],
+            check=True, capture_output=True
+        )
+
+    def _combine_with_pydub(self, playable_lines, final_output):
+        """Fallback: decode and join everything in memory with pydub"""
+        # Collect every segment and join once at the end; appending to a growing
+        # AudioSegment re-copies the whole PCM buffer on each +=, which is O(N^2)
+        segments = []
+
+        # Pause values repeat, so build each silence buffer once; match the frame
+        # rate of the decoded audio so pydub doesn't resample on append
+        silences = {}
+
+        for line in playable_lines:
+            # Add the line audio
+            audio_segment = load_audio(line["audio_file"])
+            segments.append(audio_segment)
+
+            # Add pause based on context (without sound effects)
+            pause_ms = int(line["pause_after"] * 1000)
+            silence = silences.get(pause_ms)
+            if silence is None:
+                silence = silences.setdefault(
+                    pause_ms,
+                    AudioSegment.silent(duration=pause_ms, frame_rate=audio_segment.frame_rate)
+                )
+            segments.append(silence)
+
+        if not segments:
+            return
+
+        # Coerce everything to the format of the first segment, then join the raw
+        # PCM with one C-level b"".join instead of repeated reallocation
+        first = segments[0]
+        normalized = [
+            s.set_frame_rate(first.frame_rate).set_channels(first.channels).set_sample_width(first.sample_width)
+            for s in segments
+        ]
+        combined = first._spawn(b"".join(s._data for s in normalized))
+
+        combined.export(final_output, format="mp3")
+
     def combine_audio_files(self):
         """Combine all generated audio files into a complete narrative"""
         print("\nCombining audio files...")
-        combined = AudioSegment.empty()
+        playable_lines = []
         missing_files = []
-        
-        # Process each line
+
+        # Check each line up front
         for line_index, line in enumerate(self.script_data["lines"]):
             if "audio_file" in line and os.path.exists(line["audio_file"]):
-                # Add the line audio
-                audio_segment = AudioSegment.from_mp3(line["audio_file"])
-                combined += audio_segment
-                
-                # Add pause based on context (without sound effects)
-                pause_duration = int(line["pause_after"] * 1000)
-                silence = AudioSegment.silent(duration=pause_duration)
-                combined += silence
+                playable_lines.append(line)
             else:
                 print(f"Warning: Missing audio for line {line_index+1}")
                 missing_files.append(line_index+1)
-        
+
         if missing_files:
             print(f"Warning: {len(missing_files)} lines are missing audio: {missing_files}")
             choice = input("Continue with missing files? (y/n): ").lower()
             if choice != 'y':
                 return None
-        
-        # Export the final combined audio
+
         final_output = f"{self.output_dir}/complete_story.mp3"
-        combined.export(final_output, format="mp3")
+
+        # Prefer the ffmpeg concat demuxer: it streams MP3 frames straight through
+        # without decoding, so memory stays flat and nothing is re-encoded
+        if shutil.which("ffmpeg"):
+            try:
+                self._combine_with_ffmpeg(playable_lines, final_output)
+            except subprocess.CalledProcessError as e:
+                print(f"ffmpeg concat failed ({str(e)}), falling back to pydub")
+                self._combine_with_pydub(playable_lines, final_output)
+        else:
+            self._combine_with_pydub(playable_lines, final_output)
+
         print(f"Exported complete story: {final_output}")
         return final_output
     
@@ -332,8 +700,12 @@ class StoryGenerator:
         final_output = f"{self.output_dir}/complete_story.mp3"
         if os.path.exists(final_output):
             print(f"Playing complete story...")
-            audio = AudioSegment.from_mp3(final_output)
-            play(audio)
+            audio = load_audio(final_output)
+            try:
+                self._play_segment(audio)
+            except KeyboardInterrupt:
+                self.stop_playback()
+                print("Playback interrupted")
             return True
         else:
             print("Combined audio file doesn't exist yet")
@@ -1,193 +1,473 @@
 from pathlib import Path
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from aiolimiter import AsyncLimiter
 import tiktoken
+import argparse
+import asyncio
+import hashlib
 import json
 import os
+import sqlite3
 import time
 
 # Initialize OpenAI client
-client = OpenAI()
+client = AsyncOpenAI()
 
-def split_text_into_chunks(input_file="input.txt", max_tokens=1900):
-    """Split the input file into manageable chunks for processing"""
+# How many analysis requests to keep in flight, and the request-rate ceiling
+CONCURRENCY = 20
+REQUESTS_PER_MINUTE = 500
+
+# How many consecutive lines to analyze per request; they share one context
+# window, so this divides both the request count and the repeated input tokens
+GROUP_SIZE = 10
+
+# Cheap first-pass model, and the model uncertain lines are escalated to
+MODEL = "gpt-4o-mini"
+ESCALATION_MODEL = "gpt-4o"
+
+# How often to poll a submitted Batch API job
+BATCH_POLL_INTERVAL = 60
+
+# Disk-backed cache of line analyses, keyed by a hash of the full prompt.
+# Behavior is set once from the command line in __main__ (--no-cache,
+# --cache-ttl) instead of library functions scanning sys.argv themselves.
+CACHE_DB = ".llm_cache/analyses.db"
+CACHE_ENABLED = True
+CACHE_TTL_DAYS = None
+
+def split_text_into_lines(input_file="input.txt"):
+    """Split the input file into non-empty lines, no tokenization involved"""
     try:
         # Read the input file
         with open(input_file, "r", encoding="utf-8") as f:
             text = f.read()
-        
-        # Initialize the tokenizer
-        encoding = tiktoken.get_encoding("cl100k_base")
-        
-        # Split into lines
-        lines = [line for line in text.splitlines() if line.strip()]
-        
-        # Get token count for each line
-        line_tokens = [len(encoding.encode(line)) for line in lines]
-        
-        return lines, line_tokens
+
+        return [line for line in text.splitlines() if line.strip()]
     except Exception as e:
         print(f"Error splitting text: {str(e)}")
-        return [], []
-
-def analyze_line_with_llm(line, context_lines, line_index, total_lines, characters_seen=[]):
-    """Use OpenAI to analyze the emotional context and suggest sound effects"""
-    # Compile the context window (5 lines before and after if available)
-    start_idx = max(0, line_index - 5)
-    end_idx = min(total_lines, line_index + 6)
-    context = "\n".join(context_lines[start_idx:end_idx])
-    
-    # Highlight the current line in the context
-    context_with_highlight = context.replace(line, f"[CURRENT LINE]: {line}")
-    
-    try:
-        response = client.responses.create(
-            model="gpt-4o",
-            input=[
-                {"role": "system", "content": "You are a script analysis assistant specializing in dramatic readings. Analyze the emotional context of the provided line within its surrounding context. Identify dialogue, characters, emotions, and suggest appropriate voice modulation and sound effects."},
-                {"role": "user", "content": f"Here's a segment from a story, with the current line marked as [CURRENT LINE]:\n\n{context_with_highlight}\n\nAnalyze the current line for: dialogue detection, character identification (who is speaking?), emotional content, appropriate pause length after this line, and sound effect suggestions. We've seen these characters so far: {', '.join(characters_seen)}. If there is no character, Narrator is the character. Provide a detailed analysis in JSON format."}
-            ],
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "line_analysis",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "is_dialogue": {
-                                "type": "string",
-                                "description": "Whether this line contains dialogue, true or false"
-                            },
-                            "character": {
-                                "type": "string",
-                                "description": "The character speaking, if identified"
-                            },
-                            "emotion": {
-                                "type": "string",
-                                "description": "The primary emotion in this line (fear, anger, sadness, joy, tension, excitement, mystery, surprise, calm, neutral, etc.)"
-                            },
-                            "intensity": {
-                                "type": "string",
-                                "description": "Emotional intensity on a scale from 1-10"
-                            },
-                            "pause_after": {
-                                "type": "string",
-                                "description": "Recommended pause after this line in seconds (0.5-3.0)"
-                            },
-                            "voice_instructions": {
-                                "type": "string",
-                                "description": "Detailed instructions for voice modulation"
-                            },
-                            "is_scene_transition": {
-                                "type": "string",
-                                "description": "Whether this line indicates a scene transition"
-                            },
-                            "is_action": {
-                                "type": "string",
-                                "description": "Whether this line describes action"
-                            },
-                            "sound_effects": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string"
-                                },
-                                "description": "Suggested sound effects that would enhance this line"
-                            }
-                        },
-                        "required": ["is_dialogue", "emotion", "intensity", "pause_after", "voice_instructions", "sound_effects", "is_action", "is_scene_transition", "character"],
-                        "additionalProperties": False
-                    },
-                    "strict": True
-                }
+        return []
+
+def count_line_tokens(lines):
+    """Token count per line in one batch call; encode_ordinary skips the
+    special-token scan and tiktoken's Rust encoder runs the lines in parallel"""
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(lines, num_threads=os.cpu_count())]
+
+SYSTEM_PROMPT = "You are a script analysis assistant specializing in dramatic readings. Analyze the emotional context of the provided line within its surrounding context. Identify dialogue, characters, emotions, and suggest appropriate voice modulation and sound effects."
+
+LINE_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "is_dialogue": {
+            "type": "string",
+            "description": "Whether this line contains dialogue, true or false"
+        },
+        "character": {
+            "type": "string",
+            "description": "The character speaking, if identified"
+        },
+        "emotion": {
+            "type": "string",
+            "description": "The primary emotion in this line (fear, anger, sadness, joy, tension, excitement, mystery, surprise, calm, neutral, etc.)"
+        },
+        "intensity": {
+            "type": "string",
+            "description": "Emotional intensity on a scale from 1-10"
+        },
+        "pause_after": {
+            "type": "string",
+            "description": "Recommended pause after this line in seconds (0.5-3.0)"
+        },
+        "voice_instructions": {
+            "type": "string",
+            "description": "Detailed instructions for voice modulation"
+        },
+        "is_scene_transition": {
+            "type": "string",
+            "description": "Whether this line indicates a scene transition"
+        },
+        "is_action": {
+            "type": "string",
+            "description": "Whether this line describes action"
+        },
+        "sound_effects": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            },
+            "description": "Suggested sound effects that would enhance this line"
+        }
+    },
+    "required": ["is_dialogue", "emotion", "intensity", "pause_after", "voice_instructions", "sound_effects", "is_action", "is_scene_transition", "character"],
+    "additionalProperties": False
+}
+
+# Wrapper object so one request can return an array of per-line analyses
+GROUP_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analyses": {
+            "type": "array",
+            "items": LINE_ANALYSIS_SCHEMA,
+            "description": "One analysis per marked line, in order"
+        }
+    },
+    "required": ["analyses"],
+    "additionalProperties": False
+}
+
+def group_pending_indices(pending_indices, size=GROUP_SIZE):
+    """Split pending line indices into runs of consecutive indices, each at
+    most size long, so every group shares one contiguous context window"""
+    groups = []
+    current = []
+    for i in pending_indices:
+        if current and (i != current[-1] + 1 or len(current) == size):
+            groups.append(current)
+            current = []
+        current.append(i)
+    if current:
+        groups.append(current)
+    return groups
+
+def render_group_window(lines, group):
+    """Shared context window (5 lines either side of the group) with each
+    group member marked as [CURRENT LINE k].
+
+    Built by concatenation around the marked lines rather than str.replace,
+    which mis-marked every occurrence when a line repeated in the window.
+    """
+    start_idx = max(0, group[0] - 5)
+    end_idx = min(len(lines), group[-1] + 6)
+    marks = {line_index: k + 1 for k, line_index in enumerate(group)}
+    parts = []
+    for j in range(start_idx, end_idx):
+        if j in marks:
+            parts.append(f"[CURRENT LINE {marks[j]}]: {lines[j]}")
+        else:
+            parts.append(lines[j])
+    return "\n".join(parts)
+
+def build_request(context_with_highlight, count, characters_seen, model=MODEL):
+    """Build the Responses API request body for analyzing a marked window"""
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Here's a segment from a story, with {count} lines marked as [CURRENT LINE 1] through [CURRENT LINE {count}]:\n\n{context_with_highlight}\n\nAnalyze each marked line for: dialogue detection, character identification (who is speaking?), emotional content, appropriate pause length after this line, and sound effect suggestions. We've seen these characters so far: {', '.join(sorted(characters_seen))}. If there is no character, Narrator is the character. Return exactly {count} analyses in marked-line order, in JSON format."}
+        ],
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "line_analyses",
+                "schema": GROUP_ANALYSIS_SCHEMA,
+                "strict": True
             }
-        )
-        
-        analysis = json.loads(response.output_text)
-        return analysis
-    
+        }
+    }
+
+def _cache_connection():
+    """Open the analysis cache, creating the database on first use"""
+    os.makedirs(os.path.dirname(CACHE_DB), exist_ok=True)
+    conn = sqlite3.connect(CACHE_DB)
+    conn.execute("CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, analysis TEXT NOT NULL, created_at REAL NOT NULL)")
+    return conn
+
+def _cache_key(request_body):
+    """Hash of model + system prompt + user prompt; identical prompts hit the cache"""
+    payload = json.dumps({
+        "model": request_body["model"],
+        "system": request_body["input"][0]["content"],
+        "prompt": request_body["input"][1]["content"]
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def cache_lookup(key):
+    """Return a cached analysis for this key, honoring the configured TTL"""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        with _cache_connection() as conn:
+            row = conn.execute("SELECT analysis, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if CACHE_TTL_DAYS is not None and time.time() - row[1] > CACHE_TTL_DAYS * 86400:
+            return None
+        return json.loads(row[0])
+    except Exception as e:
+        print(f"Error reading analysis cache: {str(e)}")
+        return None
+
+def cache_store(key, analysis):
+    """Record a fresh analysis in the cache"""
+    if not CACHE_ENABLED:
+        return
+    try:
+        with _cache_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, analysis, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(analysis), time.time())
+            )
     except Exception as e:
-        print(f"Error analyzing line with LLM: {str(e)}")
+        print(f"Error writing analysis cache: {str(e)}")
+
+def _default_analysis():
+    """Fallback analysis used when a request fails"""
+    return {
+        "is_dialogue": False,
+        "character": None,
+        "emotion": "neutral",
+        "intensity": 5,
+        "pause_after": 1.0,
+        "voice_instructions": "Read in a natural, clear voice.",
+        "is_scene_transition": False,
+        "is_action": False,
+        "sound_effects": []
+    }
+
+def _needs_escalation(analysis):
+    """Whether a mini-tier result is uncertain enough to warrant the larger model"""
+    try:
+        character = analysis.get("character")
+        if not character or str(character).strip().lower() == "unknown":
+            return True
+        return int(analysis["intensity"]) >= 8
+    except (ValueError, TypeError):
+        return True
+
+async def analyze_group_tiered(window, count, characters_seen=[]):
+    """Cheap first pass with the mini model; lines it is unsure about (no
+    character identified, or very high intensity) get a second pass from the
+    full model. Each analysis records which tier produced it in _tier."""
+    results = await analyze_group_with_llm(window, count, characters_seen)
+    for analysis in results:
+        analysis["_tier"] = MODEL
+
+    uncertain = [k for k, analysis in enumerate(results) if _needs_escalation(analysis)]
+    if uncertain:
+        try:
+            escalated = await analyze_group_with_llm(window, count, characters_seen,
+                                                     model=ESCALATION_MODEL, default_on_error=False)
+        except Exception:
+            # Keep the mini-tier analyses: they are real results, and
+            # replacing them with generic defaults would be a downgrade
+            return results
+        for k in uncertain:
+            results[k] = escalated[k]
+            results[k]["_tier"] = ESCALATION_MODEL
+
+    return results
+
+async def analyze_group_with_llm(window, count, characters_seen=[], model=MODEL, default_on_error=True):
+    """Use OpenAI to analyze a group of marked lines in a single request.
+
+    default_on_error=False re-raises failures instead of returning the
+    generic fallback analyses, for callers with a better result in hand.
+    """
+    try:
+        request_body = build_request(window, count, characters_seen, model)
+
+        # Re-runs after small edits only pay for groups whose prompt changed
+        key = _cache_key(request_body)
+        cached = cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        response = await client.responses.create(**request_body)
+
+        results = json.loads(response.output_text)["analyses"]
+        if len(results) != count:
+            raise ValueError(f"expected {count} analyses, got {len(results)}")
+        cache_store(key, results)
+        return results
+
+    except Exception as e:
+        print(f"Error analyzing lines with LLM: {str(e)}")
+        if not default_on_error:
+            raise
         # Return default values in case of error
-        return {
-            "is_dialogue": False,
-            "character": None,
-            "emotion": "neutral",
-            "intensity": 5,
-            "pause_after": 1.0,
-            "voice_instructions": "Read in a natural, clear voice.",
-            "is_scene_transition": False,
-            "is_action": False,
-            "sound_effects": []
-        }
+        return [_default_analysis() for _ in range(count)]
+
+async def _analyze_pending_lines(lines, line_tokens, pending_indices, analyses, characters_seen, progress_file):
+    """Analyze the pending lines concurrently, a group per request, flushing
+    progress as results land"""
+    sem = asyncio.Semaphore(CONCURRENCY)
+    limiter = AsyncLimiter(REQUESTS_PER_MINUTE, 60)
+    completed_queue = asyncio.Queue()
+
+    # In-run dedupe: repeated sections render to identical windows, so only
+    # the first occurrence pays for a request and the clones reuse its result
+    groups_by_window = {}
+    for group in group_pending_indices(pending_indices):
+        groups_by_window.setdefault(render_group_window(lines, group), []).append(group)
+
+    async def analyze_window(window, same_groups):
+        async with sem:
+            async with limiter:
+                results = await analyze_group_tiered(window, len(same_groups[0]), characters_seen)
+
+        for group in same_groups:
+            for result, i in zip(results, group):
+                # Each line owns its copy, with its own text and position
+                analysis = dict(result)
+                analysis["original_text"] = lines[i]
+                analysis["token_count"] = line_tokens[i]
+                analysis["line_index"] = i
+                analyses[i] = analysis
+                await completed_queue.put(i)
+
+    async def write_progress():
+        """Single writer coroutine: append one JSONL line per completed analysis"""
+        with open(progress_file, "a", buffering=1<<17, encoding="utf-8") as pf:
+            for completed in range(1, len(pending_indices) + 1):
+                i = await completed_queue.get()
+                print(f"Analyzed line {i+1} of {len(lines)} ({completed}/{len(pending_indices)} this run)")
+                pf.write(json.dumps(analyses[i]) + "\n")
+                pf.flush()
+
+    writer = asyncio.create_task(write_progress())
+    await asyncio.gather(*(analyze_window(window, same_groups)
+                           for window, same_groups in groups_by_window.items()))
+    await writer
+
+def analyze_lines_with_batch(lines, line_tokens, pending_indices, analyses, characters_seen):
+    """Analyze pending lines offline through the Batch API (50% cheaper)"""
+    sync_client = OpenAI()
+
+    # Write one Batch API request per unique group window; duplicate windows
+    # (repeated sections) share the first occurrence's request
+    groups_by_window = {}
+    for group in group_pending_indices(pending_indices):
+        groups_by_window.setdefault(render_group_window(lines, group), []).append(group)
+
+    group_map = {}
+    batch_input_file = "analysis_progress/batch_input.jsonl"
+    with open(batch_input_file, "w", encoding="utf-8") as f:
+        for window, same_groups in groups_by_window.items():
+            custom_id = f"lines-{same_groups[0][0]}-{same_groups[0][-1]}"
+            group_map[custom_id] = same_groups
+            f.write(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": build_request(window, len(same_groups[0]), characters_seen, ESCALATION_MODEL)
+            }) + "\n")
 
-def analyze_script(input_file="input.txt", output_file="enhanced_script.txt", json_output="enhanced_script.json"):
+    # Upload the input file and submit the batch
+    with open(batch_input_file, "rb") as f:
+        batch_file = sync_client.files.create(file=f, purpose="batch")
+
+    batch = sync_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(group_map)} requests covering {len(pending_indices)} lines")
+
+    # Poll until the batch finishes
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        print(f"Batch status: {batch.status}, checking again in {BATCH_POLL_INTERVAL}s...")
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = sync_client.batches.retrieve(batch.id)
+
+    if batch.status != "completed":
+        print(f"Batch {batch.id} finished with status {batch.status}")
+        return
+
+    # Download results and merge them back into place by custom_id
+    output = sync_client.files.content(batch.output_file_id)
+    for raw_line in output.text.splitlines():
+        if not raw_line.strip():
+            continue
+        try:
+            result = json.loads(raw_line)
+            output_text = result["response"]["body"]["output"][0]["content"][0]["text"]
+            results = json.loads(output_text)["analyses"]
+            for group in group_map[result["custom_id"]]:
+                for parsed, i in zip(results, group):
+                    analysis = dict(parsed)
+                    analysis["_tier"] = ESCALATION_MODEL
+                    analysis["original_text"] = lines[i]
+                    analysis["token_count"] = line_tokens[i]
+                    analysis["line_index"] = i
+                    analyses[i] = analysis
+        except Exception as e:
+            print(f"Error parsing batch result line: {str(e)}")
+
+def analyze_script(input_file="input.txt", output_file="enhanced_script.txt", json_output="enhanced_script.json", use_batch=False):
     """Analyze the input script and create an enhanced version with emotional and sound cues"""
     print(f"Reading and analyzing script from {input_file}...")
-    
-    # Get the lines and token counts
-    lines, line_tokens = split_text_into_chunks(input_file)
+
+    # Get the lines; token counts are only computed once we know there is
+    # work to do, not as a side effect of reading the file
+    lines = split_text_into_lines(input_file)
     if not lines:
         return "Failed to read input file"
-    
+    line_tokens = count_line_tokens(lines)
+
     # Create a directory for progress tracking
     os.makedirs("analysis_progress", exist_ok=True)
-    progress_file = "analysis_progress/progress.json"
-    
-    # Check if we're resuming an incomplete analysis
-    analyses = []
-    start_index = 0
-    
+    progress_file = "analysis_progress/progress.jsonl"
+
+    # Check if we're resuming an incomplete analysis; progress is append-only
+    # JSONL, one analysis per line, so resuming is just replaying the file
+    analyses = [None] * len(lines)
+
     if os.path.exists(progress_file):
         try:
             with open(progress_file, "r", encoding="utf-8") as f:
-                progress_data = json.load(f)
-                analyses = progress_data.get("analyses", [])
-                start_index = len(analyses)
-                print(f"Resuming analysis from line {start_index + 1} of {len(lines)}")
+                for position, raw_line in enumerate(f):
+                    if not raw_line.strip():
+                        continue
+                    analysis = json.loads(raw_line)
+                    index = analysis.get("line_index", position)
+                    if index < len(lines):
+                        analyses[index] = analysis
+            done = sum(1 for a in analyses if a is not None)
+            print(f"Resuming analysis with {done} of {len(lines)} lines already done")
         except:
             print("Could not read progress file. Starting from the beginning.")
-    characters_seen = set()
-    # Process each line
-    for i in range(start_index, len(lines)):
-        print(f"Analyzing line {i+1} of {len(lines)}: {lines[i][:50]}...")
-        analysis = analyze_line_with_llm(lines[i], lines, i, len(lines), characters_seen)
-        
-        # Store the original line and token count with the analysis
-        analysis["original_text"] = lines[i]
-        analysis["token_count"] = line_tokens[i]
-        characters_seen.add(analysis["character"])
-        
-        # Add to our analyses list
-        analyses.append(analysis)
-        
-        # Save progress after each analysis
-        with open(progress_file, "w", encoding="utf-8") as f:
-            json.dump({"analyses": analyses}, f, indent=2)
-        
-        # Add a small delay to avoid rate limiting
-        time.sleep(0.5)
-    
-    # Create the enhanced script file
-    with open(output_file, "w", encoding="utf-8") as f:
+
+    # Characters identified so far, from any previously completed analyses
+    characters_seen = {a["character"] for a in analyses if a is not None and a.get("character")}
+
+    # Analyze whatever is still missing, many lines at a time; use_batch
+    # routes the whole job through the offline Batch API instead
+    pending_indices = [i for i in range(len(lines)) if analyses[i] is None]
+    if pending_indices:
+        if use_batch:
+            analyze_lines_with_batch(lines, line_tokens, pending_indices, analyses, characters_seen)
+            with open(progress_file, "a", encoding="utf-8") as f:
+                for i in pending_indices:
+                    if analyses[i] is not None:
+                        f.write(json.dumps(analyses[i]) + "\n")
+        else:
+            asyncio.run(_analyze_pending_lines(lines, line_tokens, pending_indices, analyses, characters_seen, progress_file))
+
+    analyses = [a for a in analyses if a is not None]
+
+    # Create the enhanced script file: one buffered write per analysis
+    # instead of ~7 small ones each paying the text encoder and a syscall
+    with open(output_file, "w", encoding="utf-8", buffering=1<<17) as f:
         f.write("=== ENHANCED SCRIPT WITH EMOTIONAL AND SOUND CUES ===\n\n")
-        
+
         for i, analysis in enumerate(analyses):
-            f.write(f"[Line {i+1}]\n")
-            f.write(f"TEXT: {analysis['original_text']}\n")
-            
+            parts = [f"[Line {i+1}]", f"TEXT: {analysis['original_text']}"]
+
             if analysis['is_dialogue']:
-                f.write(f"DIALOGUE: Yes")
+                dialogue = "DIALOGUE: Yes"
                 if analysis['character']:
-                    f.write(f" (Character: {analysis['character']})")
-                f.write("\n")
-            
-            f.write(f"EMOTION: {analysis['emotion']} (Intensity: {analysis['intensity']})\n")
-            f.write(f"VOICE: {analysis['voice_instructions']}\n")
-            
+                    dialogue += f" (Character: {analysis['character']})"
+                parts.append(dialogue)
+
+            parts.append(f"EMOTION: {analysis['emotion']} (Intensity: {analysis['intensity']})")
+            parts.append(f"VOICE: {analysis['voice_instructions']}")
+
             if analysis['sound_effects']:
-                f.write(f"SOUND EFFECTS: {', '.join(analysis['sound_effects'])}\n")
-            
-            f.write(f"PAUSE AFTER: {analysis['pause_after']} seconds\n")
-            f.write("\n")
+                parts.append(f"SOUND EFFECTS: {', '.join(analysis['sound_effects'])}")
+
+            parts.append(f"PAUSE AFTER: {analysis['pause_after']} seconds")
+            f.write("\n".join(parts) + "\n\n")
     
     # Create the JSON output for programmatic use
     with open(json_output, "w", encoding="utf-8") as f:
@@ -203,20 +483,29 @@ def analyze_script(input_file="input.txt", output_file="enhanced_script.txt", js
 
 # Main execution
 if __name__ == "__main__":
-    import sys
+    parser = argparse.ArgumentParser(description='Analyze a script with an LLM and add emotional and sound cues.')
+    parser.add_argument('input_file', nargs='?', default=None, help='Script text file to analyze (default: input.txt)')
+    parser.add_argument('--batch', action='store_true', help='Run the analysis through the offline Batch API')
+    parser.add_argument('--no-cache', action='store_true', help='Skip the on-disk analysis cache')
+    parser.add_argument('--cache-ttl', type=float, default=None, metavar='DAYS', help='Ignore cached analyses older than this many days')
+    cli_args = parser.parse_args()
+
+    CACHE_ENABLED = not cli_args.no_cache
+    CACHE_TTL_DAYS = cli_args.cache_ttl
+
     ## if the filename is provided as a command line argument, use that
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
+    if cli_args.input_file:
+        input_file = cli_args.input_file
         print(f"Input file: {input_file}")
-        enhanced_script_file = sys.argv[1].replace(".txt", "_enhanced.txt")
-        json_script_file = sys.argv[1].replace(".txt", "_enhanced.json")
+        enhanced_script_file = input_file.replace(".txt", "_enhanced.txt")
+        json_script_file = input_file.replace(".txt", "_enhanced.json")
     else:
         input_file = "input.txt"
         enhanced_script_file = "enhanced_script.txt"
         json_script_file = "enhanced_script.json"
-    
+
     # Analyze the script
-    analyses = analyze_script(input_file, enhanced_script_file, json_script_file)
+    analyses = analyze_script(input_file, enhanced_script_file, json_script_file, use_batch=cli_args.batch)
     
     if isinstance(analyses, list):
         print(f"Enhanced script created: {enhanced_script_file}")
@@ -2,7 +2,19 @@ import json
 import os
 import shutil
 from pathlib import Path
-from pydub import AudioSegment
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dump_compact_json(data, path):
+    """Write JSON without indentation; orjson when installed, stdlib otherwise"""
+    with open(path, 'wb', buffering=1024*1024) as f:
+        if orjson is not None:
+            f.write(orjson.dumps(data))
+        else:
+            f.write(json.dumps(data, separators=(",", ":")).encode('utf-8'))
 
 # Configuration
 SOUND_EFFECTS_DIR = "downloaded_sound_effects"
@@ -10,40 +22,90 @@ NORMALIZED_EFFECTS_FILE = "sound_effects_catalog/normalized_sound_effects.json"
 ENHANCED_SCRIPT_JSON = "enhanced_script.json"
 MAPPING_FILE = "sound_effect_mapping.json"
 
-def list_missing_sounds():
-    """List all normalized sound effects that haven't been downloaded yet"""
+def _index_sound_files():
+    """Index the downloaded sound effects once: a set of filenames for O(1)
+    membership checks, plus a stem -> filename dict shared by both scans"""
+    os.makedirs(SOUND_EFFECTS_DIR, exist_ok=True)
+    # scandir's DirEntry caches the file type, so this skips a stat per name
+    with os.scandir(SOUND_EFFECTS_DIR) as it:
+        existing_files = {e.name for e in it if e.is_file()}
+    # Only the audio extensions count as sounds (stray .part/.txt/.json files
+    # must not map), preferring .mp3 over .wav over .ogg when a stem has
+    # several takes — the later passes overwrite the earlier ones
+    by_stem = {}
+    for ext in (".ogg", ".wav", ".mp3"):
+        for name in existing_files:
+            if name.endswith(ext):
+                by_stem[Path(name).stem] = name
+    return existing_files, by_stem
+
+def _enrich_missing_entries(catalog_data, missing_entries):
+    """Fill in description/alternative_search_terms for missing effects.
+
+    The bulk normalization pass leaves these fields empty on purpose; they
+    are only worth an API call for effects someone actually has to hunt down
+    in a sound library, so they are generated here on demand and persisted
+    back to the catalog so each effect pays for enrichment once.
+    """
+    to_enrich = [entry for entry in missing_entries
+                 if not entry.get("description") and not entry.get("alternative_search_terms")]
+    if not to_enrich:
+        return
+
+    # Imported lazily: this pulls in the OpenAI client and its dependencies
+    from extract_sound_effects import enrich_effect
+
+    print(f"Enriching {len(to_enrich)} missing effects with search metadata...")
+    for entry in to_enrich:
+        enrichment = enrich_effect(entry["original_description"])
+        entry["description"] = enrichment["description"]
+        entry["alternative_search_terms"] = enrichment["alternative_search_terms"]
+
+    with open(NORMALIZED_EFFECTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(catalog_data, f, indent=2)
+
+def scan_catalog():
+    """Walk the catalog once against the downloaded files, returning both the
+    missing sounds and the original-description -> file path mapping"""
     # Load the normalized effects
     with open(NORMALIZED_EFFECTS_FILE, 'r', encoding='utf-8') as f:
         catalog_data = json.load(f)
-    
+
     # Check which sounds exist
-    os.makedirs(SOUND_EFFECTS_DIR, exist_ok=True)
-    existing_files = os.listdir(SOUND_EFFECTS_DIR)
-    
-    # List missing sounds
-    missing_sounds = []
+    existing_files, by_stem = _index_sound_files()
+
+    missing_entries = []
+    mapping = {}
     for entry in catalog_data["catalog"]:
-        normalized = entry["normalized"]
-        safe_name = normalized.replace(" ", "_").lower()
-        
-        found = False
-        for ext in [".mp3", ".wav", ".ogg"]:
-            if f"{safe_name}{ext}" in existing_files:
-                found = True
-                break
-        
-        if not found:
-            missing_sounds.append({
-                "normalized": normalized,
-                "category": entry["category"],
-                "description": entry["description"],
-                "alternative_search_terms": entry["alternative_search_terms"],
-                "occurrences": entry["occurrences"]
-            })
-    
+        safe_name = entry["normalized"].replace(" ", "_").lower()
+
+        filename = by_stem.get(safe_name)
+        if filename is not None:
+            mapping[entry["original_description"]] = os.path.join(SOUND_EFFECTS_DIR, filename)
+        else:
+            missing_entries.append(entry)
+
+    # Generate search metadata for the effects we still need to find
+    _enrich_missing_entries(catalog_data, missing_entries)
+
+    missing_sounds = [{
+        "normalized": entry["normalized"],
+        "category": entry["category"],
+        "description": entry["description"],
+        "alternative_search_terms": entry["alternative_search_terms"],
+        "occurrences": entry["occurrences"]
+    } for entry in missing_entries]
+
     # Sort by occurrences (most used first)
     missing_sounds.sort(key=lambda x: -x["occurrences"])
-    
+
+    return missing_sounds, mapping
+
+def list_missing_sounds(missing_sounds=None):
+    """List all normalized sound effects that haven't been downloaded yet"""
+    if missing_sounds is None:
+        missing_sounds, _ = scan_catalog()
+
     # Print missing sounds
     if missing_sounds:
         print(f"\\nMissing {len(missing_sounds)} sound effects:")
@@ -57,31 +119,11 @@ def list_missing_sounds():
     
     return missing_sounds
 
-def update_sound_mapping():
+def update_sound_mapping(mapping=None):
     """Update the sound effect mapping based on downloaded files"""
-    # Load the normalized effects
-    with open(NORMALIZED_EFFECTS_FILE, 'r', encoding='utf-8') as f:
-        catalog_data = json.load(f)
-    
-    # Check which sounds exist
-    os.makedirs(SOUND_EFFECTS_DIR, exist_ok=True)
-    existing_files = os.listdir(SOUND_EFFECTS_DIR)
-    
-    # Create mapping
-    mapping = {}
-    
-    for entry in catalog_data["catalog"]:
-        normalized = entry["normalized"]
-        original = entry["original_description"]
-        safe_name = normalized.replace(" ", "_").lower()
-        
-        # Check for files with common audio extensions
-        for ext in [".mp3", ".wav", ".ogg"]:
-            filename = f"{safe_name}{ext}"
-            if filename in existing_files:
-                mapping[original] = os.path.join(SOUND_EFFECTS_DIR, filename)
-                break
-    
+    if mapping is None:
+        _, mapping = scan_catalog()
+
     # Save the mapping
     with open(MAPPING_FILE, 'w', encoding='utf-8') as f:
         json.dump(mapping, f, indent=2)
@@ -91,12 +133,13 @@ def update_sound_mapping():
     
     return mapping
 
-def update_script_with_sounds():
+def update_script_with_sounds(mapping=None):
     """Update the enhanced script with sound effect file paths"""
-    # Load the mapping
-    with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
-        mapping = json.load(f)
-    
+    # Load the mapping unless the caller already has it in hand
+    if mapping is None:
+        with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+
     # Load the enhanced script
     with open(ENHANCED_SCRIPT_JSON, 'r', encoding='utf-8') as f:
         script_data = json.load(f)
@@ -115,10 +158,10 @@ def update_script_with_sounds():
                 if effect in mapping:
                     line["sound_effect_files"].append(mapping[effect])
     
-    # Save the updated script
-    with open("enhanced_script_with_sounds.json", 'w', encoding='utf-8') as f:
-        json.dump(script_data, f, indent=2)
-    
+    # Save the updated script; compact output is roughly half the bytes of
+    # indent=2 and encodes much faster on MB-scale scripts
+    _dump_compact_json(script_data, "enhanced_script_with_sounds.json")
+
     print("Enhanced script updated with sound effect file paths")
 
 def main():
@@ -139,9 +182,11 @@ def main():
     elif choice == "3":
         update_script_with_sounds()
     elif choice == "4":
-        list_missing_sounds()
-        update_sound_mapping()
-        update_script_with_sounds()
+        # One catalog scan feeds all three steps
+        missing_sounds, mapping = scan_catalog()
+        list_missing_sounds(missing_sounds)
+        update_sound_mapping(mapping)
+        update_script_with_sounds(mapping)
     elif choice.lower() == "q":
         print("Goodbye!")
     else:
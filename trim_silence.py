@@ -2,11 +2,73 @@
 
 import os
 import argparse
-import numpy as np
-from pydub import AudioSegment
-import soundfile as sf
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 import glob
 
+# numpy/soundfile/pydub are imported inside the functions that need them:
+# loading pydub alone costs tens of ms (audioop, ffmpeg discovery), which is
+# pure overhead for invocations that bail out before touching any audio
+
+def _read_audio(file_path):
+    """
+    Read an audio file as (data, mono_samples, sample_rate, segment).
+
+    Tries soundfile first (WAV/FLAC/OGG: direct libsndfile read, no ffmpeg
+    subprocess or PCM copy); falls back to pydub for MP3/M4A. Exactly one of
+    data (soundfile ndarray) and segment (AudioSegment) is not None, so the
+    caller knows which writer to use.
+    """
+    import numpy as np
+    import soundfile as sf
+
+    try:
+        data, sample_rate = sf.read(file_path, dtype='int16', always_2d=True)
+        mono_samples = data.astype(np.float32).mean(axis=1)
+        return data, mono_samples, sample_rate, None
+    except Exception:
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(file_path)
+        if segment.sample_width != 2:
+            segment = segment.set_sample_width(2)
+        mono_samples = np.frombuffer(segment.raw_data, dtype=np.int16).reshape(-1, segment.channels).mean(axis=1).astype(np.float32)
+        return None, mono_samples, segment.frame_rate, segment
+
+def _load_cached_samples(file_path):
+    """Return (samples, sample_rate) from the PCM cache next to the source,
+    or (None, None) if the cache is missing or older than the source.
+
+    mmap_mode='r' means reruns read straight from the OS page cache instead
+    of paying the ffmpeg decode again — the common case when tuning
+    --silence_threshold / --silence_duration.
+    """
+    import numpy as np
+
+    # The source extension stays in the cache name so song.mp3 and song.wav
+    # in one directory don't collide on the same cache files
+    cache_path = Path(f"{file_path}.pcm.npy")
+    rate_path = Path(f"{file_path}.pcm.rate.npy")
+    try:
+        source_mtime = os.path.getmtime(file_path)
+        if (cache_path.exists() and rate_path.exists()
+                and cache_path.stat().st_mtime >= source_mtime):
+            samples = np.load(cache_path, mmap_mode='r')
+            sample_rate = int(np.load(rate_path)[0])
+            return samples, sample_rate
+    except Exception:
+        pass
+    return None, None
+
+def _store_cached_samples(file_path, samples, sample_rate):
+    """Save decoded mono PCM (and its rate) beside the source for reruns"""
+    import numpy as np
+
+    try:
+        np.save(f"{file_path}.pcm.npy", samples)
+        np.save(f"{file_path}.pcm.rate.npy", np.array([sample_rate]))
+    except Exception as e:
+        print(f"Warning: could not cache PCM for {file_path}: {e}")
+
 def detect_and_trim_silence(file_path, output_dir, silence_threshold_db=-50, min_silence_duration=1000):
     """
     Analyzes an audio file, detects extended silences, and trims the file at the first second of silence.
@@ -20,52 +82,78 @@ def detect_and_trim_silence(file_path, output_dir, silence_threshold_db=-50, min
     Returns:
         Path to the trimmed file or None if no silence was found
     """
+    import numpy as np
+    import soundfile as sf
+
     try:
-        # Load the audio file
+        # Load the audio file, preferring the decoded-PCM cache from a
+        # previous run over decoding the source again
         print(f"Processing {file_path}...")
-        audio = AudioSegment.from_file(file_path)
-        
-        # Convert silence threshold from dB to amplitude ratio
-        silence_threshold = audio.dBFS + silence_threshold_db
-        
-        # Get chunks that are silent
-        silence_starts = []
-        
-        # Check for silence in chunks of 10ms
+        data = segment = None
+        samples, sample_rate = _load_cached_samples(file_path)
+        if samples is None:
+            data, samples, sample_rate, segment = _read_audio(file_path)
+            _store_cached_samples(file_path, samples, sample_rate)
+
+        # Convert silence threshold from dB to amplitude ratio, with the
+        # overall level computed from the samples instead of pydub's property
+        overall_db = 20 * np.log10(np.sqrt(np.mean(samples ** 2)) / 32768 + 1e-12)
+        silence_threshold = overall_db + silence_threshold_db
+
+        # Check for silence in windows of 10ms
         chunk_size = 10
-        
-        for i in range(0, len(audio) - chunk_size, chunk_size):
-            chunk = audio[i:i+chunk_size]
-            if chunk.dBFS < silence_threshold:
-                silence_starts.append(i)
-            elif len(silence_starts) > 0:
-                # If we found silence but now there's sound, reset
-                silence_starts = []
-                
-            # Check if we have accumulated enough silent chunks to meet min_silence_duration
-            if len(silence_starts) * chunk_size >= min_silence_duration:
-                # We found our first second of silence
-                trim_point = silence_starts[0]
-                print(f"Found silence at {trim_point/1000:.2f} seconds")
-                
-                # Trim the audio
-                trimmed_audio = audio[:trim_point]
-                
-                # Create output filename
-                filename = os.path.basename(file_path)
-                base_name, ext = os.path.splitext(filename)
-                output_path = os.path.join(output_dir, f"{base_name}{ext}")
-                
-                # Export the trimmed audio
-                trimmed_audio.export(output_path, format=ext.replace('.', ''))
-                print(f"Trimmed file saved to {output_path}")
-                
-                return output_path
-                
+
+        # Compute the RMS of every 10ms window in a single vectorized pass
+        window = int(sample_rate * chunk_size / 1000)
+        usable = len(samples) - (len(samples) % window)
+
+        trim_point = None
+        if usable > 0 and window > 0:
+            windows = samples[:usable].reshape(-1, window)
+            rms = np.sqrt((windows ** 2).mean(axis=1))
+            db = 20 * np.log10(rms / 32768 + 1e-12)
+            silent = db < silence_threshold
+
+            # First index where min_silence_duration worth of windows are all
+            # silent: a running count via cumsum gives every window-of-needed
+            # sum in O(N), then argmax finds the first full run
+            needed = max(1, int(min_silence_duration / chunk_size))
+            if len(silent) >= needed:
+                csum = np.cumsum(silent, dtype=np.int32)
+                run_counts = csum[needed - 1:].copy()
+                run_counts[1:] -= csum[:-needed]
+                runs = run_counts == needed
+                if runs.any():
+                    trim_point = int(np.argmax(runs)) * chunk_size
+
+        if trim_point is not None:
+            # We found our first second of silence
+            print(f"Found silence at {trim_point/1000:.2f} seconds")
+
+            # Create output filename
+            filename = os.path.basename(file_path)
+            base_name, ext = os.path.splitext(filename)
+            output_path = os.path.join(output_dir, f"{base_name}{ext}")
+
+            # Detection may have run entirely off the PCM cache; decode the
+            # source now only because we actually have something to export
+            if segment is None and data is None:
+                data, _, sample_rate, segment = _read_audio(file_path)
+
+            # Export the trimmed audio with whichever backend decoded it
+            if segment is not None:
+                segment[:trim_point].export(output_path, format=ext.replace('.', ''))
+            else:
+                end_sample = int(trim_point / 1000 * sample_rate)
+                sf.write(output_path, data[:end_sample], sample_rate)
+            print(f"Trimmed file saved to {output_path}")
+
+            return output_path
+
         # If we get here, no extended silence was found
         print(f"No extended silence found in {file_path}")
         return None
-        
+
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
         return None
@@ -101,21 +189,27 @@ def main():
     
     print(f"Found {len(audio_files)} audio files to process")
     
-    # Process each file
+    # Process the files in parallel; each one is independent decode + DSP +
+    # encode work, so this scales with core count
     processed_count = 0
     trimmed_count = 0
-    
-    for file_path in audio_files:
-        processed_count += 1
-        result = detect_and_trim_silence(
-            file_path, 
-            output_dir, 
-            silence_threshold_db=args.silence_threshold,
-            min_silence_duration=int(args.silence_duration * 1000)
-        )
-        
-        if result:
-            trimmed_count += 1
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(
+                detect_and_trim_silence,
+                file_path,
+                output_dir,
+                args.silence_threshold,
+                int(args.silence_duration * 1000)
+            ): file_path
+            for file_path in audio_files
+        }
+
+        for future in as_completed(futures):
+            processed_count += 1
+            if future.result():
+                trimmed_count += 1
     
     print(f"\nProcessing complete. Processed {processed_count} files, trimmed {trimmed_count} files.")
     print(f"Trimmed files saved to {output_dir}")